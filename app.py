@@ -1,677 +1,931 @@
-"""
-HR-Tech 株価・ニュース 比較ダッシュボード
-対象: プラスアルファ・コンサルティング / カオナビ / SmartHR / HRブレイン
-
-依存: pip install -r requirements.txt
-起動: streamlit run app.py --browser.gatherUsageStats false
-"""
-
-import streamlit as st
-import streamlit.components.v1 as components
-import yfinance as yf
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import requests
-from bs4 import BeautifulSoup
-import feedparser
-from datetime import datetime
-import urllib.parse
-import re
-
-# ======================================================================
-# 対象企業定義
-# ======================================================================
-COMPANIES = [
-    {
-        "name":    "プラスアルファ・コンサルティング",
-        "short":   "プラスアルファ",
-        "ticker":  "4071.T",
-        "code":    "4071",
-        "market":  "東証プライム",
-        "color":   "#e74c3c",
-        "product": "タレントパレット",
-        "service": "タレントマネジメント・HR データ分析",
-        "target":  "中堅〜大企業",
-        "news_q":  "プラスアルファ コンサルティング 4071",
-        "ir_url":  "https://www.pa-consul.co.jp/ir/news/",
-        "web_url": "https://www.pa-consul.co.jp/",
-    },
-    {
-        "name":    "カオナビ",
-        "short":   "カオナビ",
-        "ticker":  None,           # 上場廃止
-        "code":    "4435（上場廃止）",
-        "market":  "上場廃止",
-        "color":   "#3498db",
-        "product": "カオナビ",
-        "service": "クラウド人材管理・組織図・人事データ活用",
-        "target":  "中堅〜大企業",
-        "news_q":  "カオナビ 人事 HR",
-        "ir_url":  "https://corp.kaonavi.jp/news/",
-        "web_url": "https://kaonavi.jp/",
-    },
-    {
-        "name":    "SmartHR",
-        "short":   "SmartHR",
-        "ticker":  None,           # 非上場
-        "code":    "非上場",
-        "market":  "非上場",
-        "color":   "#27ae60",
-        "product": "SmartHR",
-        "service": "クラウド人事・労務管理・タレントマネジメント",
-        "target":  "スタートアップ〜大企業",
-        "news_q":  "SmartHR スマートHR",
-        "ir_url":  "https://smarthr.co.jp/news/",
-        "web_url": "https://smarthr.co.jp/",
-    },
-    {
-        "name":    "HRブレイン",
-        "short":   "HRブレイン",
-        "ticker":  None,           # 非上場
-        "code":    "非上場",
-        "market":  "非上場",
-        "color":   "#f39c12",
-        "product": "HRBrain",
-        "service": "タレントマネジメント・人事評価・エンゲージメント",
-        "target":  "中堅〜大企業",
-        "news_q":  "HRブレイン HRBrain 人事",
-        "ir_url":  "https://hrbrain.jp/news/",
-        "web_url": "https://hrbrain.jp/",
-    },
-]
-
-# ======================================================================
-# ページ設定
-# ======================================================================
-st.set_page_config(
-    page_title="HR-Tech 比較ダッシュボード",
-    page_icon="📊",
-    layout="wide",
-)
-
-st.markdown("""
-<style>
-    .stTabs [data-baseweb="tab"] { font-size: 0.95rem; padding: 6px 18px; }
-    [data-testid="stMetricValue"] { font-size: 1.4rem !important; font-weight: 700; }
-    footer { visibility: hidden; }
-    .company-badge {
-        display: inline-block; padding: 2px 10px; border-radius: 12px;
-        font-size: 0.8rem; font-weight: 600; margin-left: 8px;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-
-# ======================================================================
-# チャート共通フォント設定
-# ======================================================================
-_FONT        = dict(family="Meiryo, Yu Gothic, sans-serif", size=14, color="#2c3e50")
-_TITLE_FONT  = dict(family="Meiryo, Yu Gothic, sans-serif", size=17, color="#1a1a2e")
-_AXIS_FONT   = dict(size=13, color="#2c3e50")
-_TICK_FONT   = dict(size=12, color="#2c3e50")
-_LEGEND_FONT = dict(size=13, color="#2c3e50")
-
-
-def _common_layout(**kwargs) -> dict:
-    base = dict(
-        font=_FONT,
-        title_font=_TITLE_FONT,
-        legend=dict(
-            font=_LEGEND_FONT,
-            bgcolor="rgba(255,255,255,0.9)",
-            bordercolor="#ddd",
-            borderwidth=1,
-        ),
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        hoverlabel=dict(font_size=13, bgcolor="white"),
-    )
-    base.update(kwargs)
-    return base
-
-
-def _style_axes(fig: go.Figure):
-    fig.update_xaxes(
-        title_font=_AXIS_FONT, tickfont=_TICK_FONT,
-        showgrid=True, gridcolor="#ececec", gridwidth=1,
-        linecolor="#ccc", linewidth=1, showline=True,
-    )
-    fig.update_yaxes(
-        title_font=_AXIS_FONT, tickfont=_TICK_FONT,
-        showgrid=True, gridcolor="#ececec", gridwidth=1,
-        linecolor="#ccc", linewidth=1, showline=True,
-    )
-    return fig
-
-
-def _ja_date_format(period_label: str) -> str:
-    """表示期間に応じた日本語日付フォーマット（D3 tickformat）を返す"""
-    if period_label in ("1週間", "1ヶ月"):
-        return "%m月%d日"
-    return "%Y年%m月"
-
-
-# ======================================================================
-# データ取得（キャッシュ付き）
-# ======================================================================
-
-@st.cache_data(ttl=300)
-def fetch_stock(ticker: str, period: str):
-    try:
-        t = yf.Ticker(ticker)
-        hist = t.history(period=period)
-        info = {}
-        try:
-            info = t.info
-        except Exception:
-            pass
-        return hist, info
-    except Exception:
-        return pd.DataFrame(), {}
-
-
-@st.cache_data(ttl=600)
-def fetch_google_news(query: str) -> list[dict]:
-    q = urllib.parse.quote(query)
-    url = f"https://news.google.com/rss/search?q={q}&hl=ja&gl=JP&ceid=JP:ja"
-    try:
-        feed = feedparser.parse(url)
-        results = []
-        for e in feed.entries[:20]:
-            pub = ""
-            if getattr(e, "published_parsed", None):
-                pub = datetime(*e.published_parsed[:6]).strftime("%Y-%m-%d")
-            src = getattr(getattr(e, "source", None), "title", "Google News")
-            results.append({
-                "date":   pub,
-                "title":  e.get("title", ""),
-                "link":   e.get("link", ""),
-                "source": src,
-            })
-        return results
-    except Exception:
-        return []
-
-
-@st.cache_data(ttl=600)
-def fetch_ir_news(url: str) -> list[dict]:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-        ),
-        "Accept-Language": "ja,en;q=0.9",
-    }
-    results = []
-    DATE_PAT = re.compile(r"\d{4}[./年]\d{1,2}[./月]\d{1,2}")
-
-    def _extract_date(node) -> str:
-        for s in node.stripped_strings:
-            if DATE_PAT.search(s):
-                return s.strip()
-        return ""
-
-    try:
-        resp = requests.get(url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.content, "lxml")
-
-        # パターン1: ul > li > a
-        for ul in soup.find_all("ul"):
-            items = ul.find_all("li")
-            batch = []
-            for li in items:
-                a = li.find("a")
-                if not a:
-                    continue
-                title = a.get_text(strip=True)
-                if len(title) < 5:
-                    continue
-                href = a.get("href", "")
-                if href and not href.startswith("http"):
-                    href = urllib.parse.urljoin(url, href)
-                batch.append({"date": _extract_date(li), "title": title,
-                              "link": href, "source": "IR"})
-            if len(batch) >= 3:
-                results = batch[:20]
-                break
-
-        # パターン2: dl > dt + dd
-        if not results:
-            for dl in soup.find_all("dl"):
-                dts = dl.find_all("dt")
-                dds = dl.find_all("dd")
-                if len(dts) < 2:
-                    continue
-                batch = []
-                for dt, dd in zip(dts, dds):
-                    a = dd.find("a") or dt.find("a")
-                    if not a:
-                        continue
-                    title = a.get_text(strip=True)
-                    href = a.get("href", "")
-                    if href and not href.startswith("http"):
-                        href = urllib.parse.urljoin(url, href)
-                    batch.append({"date": _extract_date(dt) or _extract_date(dd),
-                                  "title": title, "link": href, "source": "IR"})
-                if len(batch) >= 2:
-                    results = batch[:20]
-                    break
-    except Exception:
-        pass
-    return results
-
-
-# ======================================================================
-# チャート作成
-# ======================================================================
-
-def make_stock_chart(hist: pd.DataFrame, comp: dict, period_label: str) -> go.Figure:
-    """ローソク足 + 移動平均 + 出来高"""
-    fig = make_subplots(
-        rows=2, cols=1, shared_xaxes=True,
-        vertical_spacing=0.04, row_heights=[0.75, 0.25],
-    )
-    fig.add_trace(go.Candlestick(
-        x=hist.index,
-        open=hist["Open"], high=hist["High"],
-        low=hist["Low"],  close=hist["Close"],
-        name="株価",
-        increasing=dict(line=dict(color="#e74c3c"), fillcolor="#e74c3c"),
-        decreasing=dict(line=dict(color="#3498db"), fillcolor="#3498db"),
-    ), row=1, col=1)
-
-    df_ma = hist.copy()
-    for window, color, dash in [(5, "orange", "solid"), (25, "#8e44ad", "solid"), (75, "#27ae60", "dot")]:
-        if len(df_ma) >= window:
-            df_ma[f"MA{window}"] = df_ma["Close"].rolling(window).mean()
-            fig.add_trace(go.Scatter(
-                x=df_ma.index, y=df_ma[f"MA{window}"],
-                name=f"{window}日MA",
-                line=dict(color=color, width=1.5, dash=dash),
-                opacity=0.85,
-            ), row=1, col=1)
-
-    vol_colors = ["#e74c3c" if c >= o else "#3498db"
-                  for c, o in zip(hist["Close"], hist["Open"])]
-    fig.add_trace(go.Bar(
-        x=hist.index, y=hist["Volume"], name="出来高",
-        marker_color=vol_colors, opacity=0.65,
-    ), row=2, col=1)
-
-    fig.update_layout(**_common_layout(
-        title=f"{comp['name']}（{comp['code']}）ローソク足チャート（{period_label}）",
-        xaxis_rangeslider_visible=False,
-        height=620,
-        showlegend=True,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02,
-                    xanchor="right", x=1, font=_LEGEND_FONT,
-                    bgcolor="rgba(255,255,255,0.9)", bordercolor="#ddd", borderwidth=1),
-        yaxis_title="株価（円）",
-        yaxis2_title="出来高",
-        margin=dict(l=70, r=30, t=90, b=30),
-        hovermode="x unified",
-    ))
-    fig.update_xaxes(showspikes=True, spikemode="across", spikethickness=1)
-    _style_axes(fig)
-    fig.update_xaxes(tickformat=_ja_date_format(period_label))
-    return fig
-
-
-def make_line_chart(hist: pd.DataFrame, comp: dict, period_label: str) -> go.Figure:
-    """終値推移（折れ線）"""
-    close = hist["Close"]
-    color = "#e74c3c" if close.iloc[-1] >= close.iloc[0] else "#3498db"
-    rgb = ",".join(str(int(color[i:i+2], 16)) for i in (1, 3, 5))
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=hist.index, y=close,
-        mode="lines", name="終値",
-        line=dict(color=color, width=2),
-        fill="tozeroy", fillcolor=f"rgba({rgb},0.08)",
-        hovertemplate="%{x|%Y-%m-%d}<br>終値: %{y:,.0f}円<extra></extra>",
-    ))
-    fig.add_hline(
-        y=close.iloc[0], line_dash="dot", line_color="gray", opacity=0.6,
-        annotation_text=f"起点 {close.iloc[0]:,.0f}円",
-        annotation_position="right",
-    )
-    fig.update_layout(**_common_layout(
-        title=f"{comp['short']} 終値推移（{period_label}）",
-        height=480, xaxis_title="日付", yaxis_title="株価（円）",
-        margin=dict(l=70, r=30, t=70, b=50),
-        hovermode="x unified",
-    ))
-    _style_axes(fig)
-    fig.update_xaxes(tickformat=_ja_date_format(period_label))
-    return fig
-
-
-def make_volume_chart(hist: pd.DataFrame, comp: dict, period_label: str) -> go.Figure:
-    """出来高棒グラフ"""
-    vol_colors = ["#e74c3c" if c >= o else "#3498db"
-                  for c, o in zip(hist["Close"], hist["Open"])]
-    fig = go.Figure(go.Bar(
-        x=hist.index, y=hist["Volume"],
-        marker_color=vol_colors, opacity=0.75, name="出来高",
-        hovertemplate="%{x|%Y-%m-%d}<br>出来高: %{y:,.0f}<extra></extra>",
-    ))
-    fig.update_layout(**_common_layout(
-        title=f"{comp['short']} 出来高（{period_label}）",
-        height=400, xaxis_title="日付", yaxis_title="出来高",
-        margin=dict(l=70, r=30, t=70, b=50),
-    ))
-    _style_axes(fig)
-    fig.update_xaxes(tickformat=_ja_date_format(period_label))
-    return fig
-
-
-# ======================================================================
-# 企業概要・株価指標 比較表
-# ======================================================================
-
-def build_overview_table() -> pd.DataFrame:
-    rows = []
-    for c in COMPANIES:
-        rows.append({
-            "会社名":       c["name"],
-            "上場状況":     c["market"],
-            "証券コード":   c["code"],
-            "主力製品":     c["product"],
-            "サービス概要": c["service"],
-            "ターゲット":   c["target"],
-            "公式サイト":   c["web_url"],
-        })
-    return pd.DataFrame(rows).set_index("会社名")
-
-
-def build_stock_metrics_table(stocks: dict, period_label: str) -> pd.DataFrame:
-    rows = []
-    for comp in COMPANIES:
-        name = comp["name"]
-        if name not in stocks or stocks[name][0].empty:
-            rows.append({
-                "会社名":    comp["short"],
-                "現在値（円）": "---",
-                "前日比（%）": "---",
-                f"期間騰落率（{period_label}）": "---",
-                "期間高値（円）": "---",
-                "期間安値（円）": "---",
-                "PER（倍）": "---",
-                "PBR（倍）": "---",
-                "備考":      comp["market"],
-            })
-            continue
-        hist, info = stocks[name]
-        latest  = hist.iloc[-1]
-        prev    = hist.iloc[-2] if len(hist) >= 2 else hist.iloc[-1]
-        price   = latest["Close"]
-        chg_pct = (price - prev["Close"]) / prev["Close"] * 100 if prev["Close"] else 0
-        ret     = (hist["Close"].iloc[-1] / hist["Close"].iloc[0] - 1) * 100
-        per = info.get("trailingPE")
-        pbr = info.get("priceToBook")
-        rows.append({
-            "会社名":    comp["short"],
-            "現在値（円）": f"{price:,.0f}",
-            "前日比（%）": f"{chg_pct:+.2f}%",
-            f"期間騰落率（{period_label}）": f"{ret:+.2f}%",
-            "期間高値（円）": f"{hist['High'].max():,.0f}",
-            "期間安値（円）": f"{hist['Low'].min():,.0f}",
-            "PER（倍）": f"{per:.1f}" if per else "---",
-            "PBR（倍）": f"{pbr:.2f}" if pbr else "---",
-            "備考":      comp["market"],
-        })
-    return pd.DataFrame(rows).set_index("会社名")
-
-
-# ======================================================================
-# 表示ヘルパー
-# ======================================================================
-
-def render_stock_metrics(hist: pd.DataFrame, info: dict, period_label: str):
-    latest  = hist.iloc[-1]
-    prev    = hist.iloc[-2] if len(hist) >= 2 else hist.iloc[-1]
-    price   = latest["Close"]
-    chg     = price - prev["Close"]
-    chg_pct = chg / prev["Close"] * 100 if prev["Close"] else 0
-    ret     = (hist["Close"].iloc[-1] / hist["Close"].iloc[0] - 1) * 100
-    per = info.get("trailingPE")
-    pbr = info.get("priceToBook")
-
-    c1, c2, c3, c4, c5, c6, c7 = st.columns(7)
-    c1.metric("現在値（円）", f"{price:,.0f}", f"{chg:+.0f}（{chg_pct:+.2f}%）")
-    c2.metric("出来高",      f"{int(latest['Volume']):,}")
-    c3.metric(f"期間騰落率（{period_label}）", f"{ret:+.2f}%")
-    c4.metric("期間高値（円）", f"{hist['High'].max():,.0f}")
-    c5.metric("期間安値（円）", f"{hist['Low'].min():,.0f}")
-    c6.metric("PER", f"{per:.1f}倍" if per else "---")
-    c7.metric("PBR", f"{pbr:.2f}倍" if pbr else "---")
-
-
-def render_stock_tabs(hist: pd.DataFrame, comp: dict, period_label: str):
-    ct1, ct2, ct3, ct4 = st.tabs(["ローソク足", "終値推移", "出来高", "データ表"])
-    with ct1:
-        st.plotly_chart(make_stock_chart(hist, comp, period_label), use_container_width=True)
-    with ct2:
-        st.plotly_chart(make_line_chart(hist, comp, period_label), use_container_width=True)
-    with ct3:
-        st.plotly_chart(make_volume_chart(hist, comp, period_label), use_container_width=True)
-    with ct4:
-        df_t = hist[["Open", "High", "Low", "Close", "Volume"]].copy()
-        df_t.index = pd.to_datetime(df_t.index).strftime("%Y-%m-%d")
-        df_t.index.name = "日付"
-        df_t.columns = ["始値", "高値", "安値", "終値", "出来高"]
-        df_t["前日比（円）"] = df_t["終値"].diff().round(0)
-        df_t["前日比（%）"] = (df_t["終値"].pct_change() * 100).round(2)
-        df_t = df_t.iloc[::-1]
-
-        def _color(val):
-            try:
-                v = float(val)
-                return "color: #e74c3c" if v > 0 else ("color: #3498db" if v < 0 else "")
-            except (TypeError, ValueError):
-                return ""
-
-        styled = (
-            df_t.style
-            .format({
-                "始値": "{:,.0f}", "高値": "{:,.0f}",
-                "安値": "{:,.0f}", "終値": "{:,.0f}", "出来高": "{:,.0f}",
-                "前日比（円）": lambda x: f"{x:+.0f}" if pd.notna(x) else "---",
-                "前日比（%）": lambda x: f"{x:+.2f}%" if pd.notna(x) else "---",
-            })
-            .map(_color, subset=["前日比（円）", "前日比（%）"])
-        )
-        st.dataframe(styled, use_container_width=True, height=500)
-
-
-def render_news(comp: dict):
-    col_gn, col_ir = st.columns(2)
-
-    with col_gn:
-        st.markdown("**Google News**")
-        with st.spinner("取得中..."):
-            items = fetch_google_news(comp["news_q"])
-        if not items:
-            st.info("ニュースが見つかりませんでした。")
-        else:
-            for item in items[:10]:
-                if item["link"]:
-                    st.markdown(f"[{item['title']}]({item['link']})")
-                else:
-                    st.markdown(item["title"])
-                st.caption(f"{item['date']} | {item['source']}")
-                st.divider()
-
-    with col_ir:
-        st.markdown("**IR / ニュース**")
-        with st.spinner("取得中..."):
-            items = fetch_ir_news(comp["ir_url"])
-        if not items:
-            st.info("自動取得できませんでした。")
-            st.markdown(f"[公式ページを開く]({comp['ir_url']})")
-        else:
-            for item in items[:10]:
-                if item["link"]:
-                    st.markdown(f"[{item['title']}]({item['link']})")
-                else:
-                    st.markdown(item["title"])
-                if item["date"]:
-                    st.caption(item["date"])
-                st.divider()
-
-
-# ======================================================================
-# メイン
-# ======================================================================
-
-def main():
-    # ── サイドバー ──────────────────────────────────────────────────────
-    with st.sidebar:
-        st.markdown("## HR-Tech 比較ダッシュボード")
-        st.divider()
-
-        period_map = {
-            "1週間": "5d", "1ヶ月": "1mo", "3ヶ月": "3mo",
-            "6ヶ月": "6mo", "1年": "1y", "3年": "3y", "5年": "5y",
-        }
-        period_label = st.selectbox("表示期間", list(period_map.keys()), index=2)
-        period = period_map[period_label]
-
-        st.divider()
-        auto_refresh = st.toggle("自動更新", value=True)
-        refresh_min = 5
-        if auto_refresh:
-            refresh_min = st.select_slider(
-                "更新間隔（分）", options=[1, 2, 5, 10, 15, 30], value=5
-            )
-
-        st.divider()
-        st.markdown("**対象企業**")
-        for comp in COMPANIES:
-            icon = "📈" if comp["ticker"] else ("🔒" if comp["market"] == "上場廃止" else "🏢")
-            st.markdown(f"{icon} **{comp['short']}** — {comp['market']}")
-
-        st.divider()
-        st.markdown("**公式リンク**")
-        for comp in COMPANIES:
-            st.markdown(f"[{comp['short']}]({comp['web_url']})")
-
-    # ── 自動更新（JS）───────────────────────────────────────────────────
-    if auto_refresh:
-        components.html(f"""
-            <script>
-                setTimeout(function() {{ window.parent.location.reload(); }},
-                           {refresh_min * 60 * 1000});
-            </script>
-        """, height=0)
-
-    # ── ヘッダー ────────────────────────────────────────────────────────
-    col_title, col_btn = st.columns([6, 1])
-    with col_title:
-        st.title("📊 HR-Tech 株価・ニュース 比較ダッシュボード")
-        st.caption(
-            "対象: " + " ／ ".join(c["short"] for c in COMPANIES)
-            + f"　|　最終更新: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}"
-            + (f"　|　{refresh_min}分毎に自動更新中" if auto_refresh else "")
-        )
-    with col_btn:
-        st.markdown("<br>", unsafe_allow_html=True)
-        if st.button("🔄 手動更新", use_container_width=True, type="primary"):
-            st.cache_data.clear()
-            st.rerun()
-
-    st.divider()
-
-    # ── 株価データ取得（上場企業のみ）────────────────────────────────────
-    stocks: dict = {}
-    with st.spinner("株価データを取得中..."):
-        for comp in COMPANIES:
-            if comp["ticker"]:
-                hist, info = fetch_stock(comp["ticker"], period)
-                stocks[comp["name"]] = (hist, info)
-
-    # ── タブ ────────────────────────────────────────────────────────────
-    tab_labels = ["📊 4社比較"] + [
-        ("📈 " if c["ticker"] else "📰 ") + c["short"]
-        for c in COMPANIES
-    ]
-    tab_compare, *company_tabs = st.tabs(tab_labels)
-
-    # ════════════════════════════════════════════
-    # 比較タブ
-    # ════════════════════════════════════════════
-    with tab_compare:
-
-        # ① 企業概要比較表
-        st.markdown("### 企業概要比較")
-        st.dataframe(build_overview_table(), use_container_width=True)
-
-        st.divider()
-
-        # ② 株価指標比較表
-        st.markdown("### 株価指標比較")
-        st.dataframe(build_stock_metrics_table(stocks, period_label), use_container_width=True)
-        st.caption(
-            "※ カオナビは上場廃止のためデータなし。"
-            "SmartHR・HRブレインは非上場のためデータなし。"
-        )
-
-    # ════════════════════════════════════════════
-    # 個別企業タブ
-    # ════════════════════════════════════════════
-    for comp, tab in zip(COMPANIES, company_tabs):
-        with tab:
-            name = comp["name"]
-
-            status_color = (
-                "#27ae60" if comp["ticker"] else
-                ("#e67e22" if comp["market"] == "上場廃止" else "#95a5a6")
-            )
-            st.markdown(
-                f"## {name}"
-                f"<span class='company-badge' style='background:{status_color}22;"
-                f"color:{status_color};border:1px solid {status_color}66'>"
-                f"{comp['market']}</span>",
-                unsafe_allow_html=True,
-            )
-
-            # 上場企業：株価情報あり
-            if comp["ticker"] and name in stocks and not stocks[name][0].empty:
-                hist, info = stocks[name]
-                render_stock_metrics(hist, info, period_label)
-                st.divider()
-                render_stock_tabs(hist, comp, period_label)
-                st.divider()
-
-            # データなし（上場廃止 or 非上場）
-            elif comp["ticker"]:
-                st.warning(f"{name} の株価データを取得できませんでした。")
-                st.divider()
-            else:
-                st.info(
-                    f"**{name}** は{comp['market']}のため株価データはありません。  \n"
-                    "ニュース・IR 情報のみ表示します。"
-                )
-                st.divider()
-
-            # ニュース（全社共通）
-            st.markdown("### ニュース・IR 情報")
-            render_news(comp)
-
-    # ── フッター ────────────────────────────────────────────────────────
-    st.divider()
-    st.caption(
-        "⚠️ このアプリは情報提供のみを目的としています。"
-        "投資判断の参考にする場合は、必ず公式情報をご確認ください。"
-    )
-    st.caption(
-        "データソース: Yahoo Finance (yfinance) ／ Google News RSS ／ 各社 IR・ニュースページ  \n"
-        "カオナビは東証グロース上場後に非公開化（上場廃止）。SmartHR・HRブレインは非上場企業。"
-    )
-
-
-if __name__ == "__main__":
-    main()
+"""
+HR-Tech 株価・ニュース 比較ダッシュボード
+対象: プラスアルファ・コンサルティング / カオナビ / SmartHR / HRブレイン
+
+依存: pip install -r requirements.txt
+起動: streamlit run app.py --browser.gatherUsageStats false
+"""
+
+from __future__ import annotations
+
+import streamlit as st
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from datetime import datetime
+from typing import TYPE_CHECKING
+import urllib.parse
+import re
+
+# 重量級ライブラリ（plotly / lxml / numpy / requests / fastfeedparser など）は
+# 初回描画を速くするため、使う関数の中で遅延 import する
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# ======================================================================
+# 対象企業定義
+# ======================================================================
+COMPANIES = [
+    {
+        "name":    "プラスアルファ・コンサルティング",
+        "short":   "プラスアルファ",
+        "ticker":  "4071.T",
+        "code":    "4071",
+        "market":  "東証プライム",
+        "color":   "#e74c3c",
+        "product": "タレントパレット",
+        "service": "タレントマネジメント・HR データ分析",
+        "target":  "中堅〜大企業",
+        "news_q":  "プラスアルファ コンサルティング 4071",
+        "ir_url":  "https://www.pa-consul.co.jp/ir/news/",
+        "web_url": "https://www.pa-consul.co.jp/",
+    },
+    {
+        "name":    "カオナビ",
+        "short":   "カオナビ",
+        "ticker":  None,           # 上場廃止
+        "code":    "4435（上場廃止）",
+        "market":  "上場廃止",
+        "color":   "#3498db",
+        "product": "カオナビ",
+        "service": "クラウド人材管理・組織図・人事データ活用",
+        "target":  "中堅〜大企業",
+        "news_q":  "カオナビ 人事 HR",
+        "ir_url":  "https://corp.kaonavi.jp/news/",
+        "web_url": "https://kaonavi.jp/",
+    },
+    {
+        "name":    "SmartHR",
+        "short":   "SmartHR",
+        "ticker":  None,           # 非上場
+        "code":    "非上場",
+        "market":  "非上場",
+        "color":   "#27ae60",
+        "product": "SmartHR",
+        "service": "クラウド人事・労務管理・タレントマネジメント",
+        "target":  "スタートアップ〜大企業",
+        "news_q":  "SmartHR スマートHR",
+        "ir_url":  "https://smarthr.co.jp/news/",
+        "web_url": "https://smarthr.co.jp/",
+    },
+    {
+        "name":    "HRブレイン",
+        "short":   "HRブレイン",
+        "ticker":  None,           # 非上場
+        "code":    "非上場",
+        "market":  "非上場",
+        "color":   "#f39c12",
+        "product": "HRBrain",
+        "service": "タレントマネジメント・人事評価・エンゲージメント",
+        "target":  "中堅〜大企業",
+        "news_q":  "HRブレイン HRBrain 人事",
+        "ir_url":  "https://hrbrain.jp/news/",
+        "web_url": "https://hrbrain.jp/",
+    },
+]
+
+# ======================================================================
+# ページ設定
+# ======================================================================
+st.set_page_config(
+    page_title="HR-Tech 比較ダッシュボード",
+    page_icon="📊",
+    layout="wide",
+)
+
+st.markdown("""
+<style>
+    .stTabs [data-baseweb="tab"] { font-size: 0.95rem; padding: 6px 18px; }
+    [data-testid="stMetricValue"] { font-size: 1.4rem !important; font-weight: 700; }
+    footer { visibility: hidden; }
+    .company-badge {
+        display: inline-block; padding: 2px 10px; border-radius: 12px;
+        font-size: 0.8rem; font-weight: 600; margin-left: 8px;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+
+# ======================================================================
+# チャート共通フォント設定
+# ======================================================================
+_FONT        = dict(family="Meiryo, Yu Gothic, sans-serif", size=14, color="#2c3e50")
+_TITLE_FONT  = dict(family="Meiryo, Yu Gothic, sans-serif", size=17, color="#1a1a2e")
+_AXIS_FONT   = dict(size=13, color="#2c3e50")
+_TICK_FONT   = dict(size=12, color="#2c3e50")
+_LEGEND_FONT = dict(size=13, color="#2c3e50")
+
+
+# 共通レイアウト・軸設定はモジュール読み込み時に一度だけ組み立てる
+_BASE_LAYOUT = dict(
+    font=_FONT,
+    title_font=_TITLE_FONT,
+    legend=dict(
+        font=_LEGEND_FONT,
+        bgcolor="rgba(255,255,255,0.9)",
+        bordercolor="#ddd",
+        borderwidth=1,
+    ),
+    plot_bgcolor="white",
+    paper_bgcolor="white",
+    hoverlabel=dict(font_size=13, bgcolor="white"),
+)
+
+_AXIS_KW = dict(
+    title_font=_AXIS_FONT, tickfont=_TICK_FONT,
+    showgrid=True, gridcolor="#ececec", gridwidth=1,
+    linecolor="#ccc", linewidth=1, showline=True,
+)
+
+
+def _common_layout(**kwargs) -> dict:
+    out = _BASE_LAYOUT.copy()
+    out.update(kwargs)
+    return out
+
+
+def _style_axes(fig: go.Figure):
+    fig.update_xaxes(**_AXIS_KW)
+    fig.update_yaxes(**_AXIS_KW)
+    return fig
+
+
+def _ja_date_format(period_label: str) -> str:
+    """表示期間に応じた日本語日付フォーマット（D3 tickformat）を返す"""
+    if period_label in ("1週間", "1ヶ月"):
+        return "%m月%d日"
+    return "%Y年%m月"
+
+
+# ======================================================================
+# データ取得（キャッシュ付き）
+# ======================================================================
+
+# 接続プール + keep-alive を共有するセッション（初回利用時に生成）
+_SESSION = None
+
+
+def _get_session():
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        s = requests.Session()
+        s.mount("https://", HTTPAdapter(
+            pool_connections=16, pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3),
+        ))
+        s.headers.update({
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+            ),
+            "Accept-Language": "ja,en;q=0.9",
+        })
+        # ワーカースレッドからも呼ばれるため、設定を終えてから公開する
+        _SESSION = s
+    return _SESSION
+
+
+# Yahoo Finance 直叩き（yfinance の複数リクエスト + 変換オーバーヘッドを回避）
+_CHART_URL   = "https://query2.finance.yahoo.com/v8/finance/chart/{ticker}"
+_SUMMARY_URL = "https://query2.finance.yahoo.com/v10/finance/quoteSummary/{ticker}"
+_CRUMB_URL   = "https://query2.finance.yahoo.com/v1/test/getcrumb"
+
+_CRUMB = None
+
+
+def _get_crumb() -> str:
+    """quoteSummary が要求する crumb を取得（Cookie はセッションに載る）"""
+    global _CRUMB
+    if _CRUMB is None:
+        s = _get_session()
+        try:
+            # Cookie 発行のためのアクセス。404 を返すが Set-Cookie は付く
+            s.get("https://fc.yahoo.com", timeout=10)
+        except Exception:
+            pass
+        r = s.get(_CRUMB_URL, timeout=10)
+        r.raise_for_status()
+        _CRUMB = r.text
+    return _CRUMB
+
+# IR ページ解析用 XPath（初回利用時に一度だけコンパイル）・日付パターン
+_IR_XPATHS = None
+_DATE_PAT  = re.compile(r"\d{4}[./年]\d{1,2}[./月]\d{1,2}")
+
+
+def _ir_xpaths():
+    global _IR_XPATHS
+    if _IR_XPATHS is None:
+        from lxml import etree
+        _IR_XPATHS = (etree.XPath(".//ul"), etree.XPath(".//li[.//a]"),
+                      etree.XPath(".//dl"))
+    return _IR_XPATHS
+
+
+def _extract_date(node) -> str:
+    return next((s.strip() for s in node.itertext() if _DATE_PAT.search(s)), "")
+
+
+@st.cache_data(ttl=300, persist="disk", max_entries=256)
+def fetch_stock(ticker: str, period: str):
+    try:
+        r = _get_session().get(_CHART_URL.format(ticker=ticker),
+                         params={"range": period, "interval": "1d"},
+                         timeout=10)
+        r.raise_for_status()
+        res = r.json()["chart"]["result"][0]
+        tz = res.get("meta", {}).get("exchangeTimezoneName", "UTC")
+        ts = pd.to_datetime(res["timestamp"], unit="s", utc=True).tz_convert(tz)
+        q = res["indicators"]["quote"][0]
+        hist = pd.DataFrame({
+            "Open":   q["open"],
+            "High":   q["high"],
+            "Low":    q["low"],
+            "Close":  q["close"],
+            "Volume": q["volume"],
+        }, index=ts).dropna()
+        return hist
+    except Exception:
+        return pd.DataFrame()
+
+
+@st.cache_data(ttl=3600, persist="disk", max_entries=64)
+def fetch_info(ticker: str) -> dict:
+    """PER / PBR など変化の遅い指標。チャート描画パスから外し 1h キャッシュ"""
+    try:
+        r = _get_session().get(_SUMMARY_URL.format(ticker=ticker),
+                         params={"modules": "summaryDetail,defaultKeyStatistics",
+                                 "crumb": _get_crumb()},
+                         timeout=10)
+        r.raise_for_status()
+        mods = r.json()["quoteSummary"]["result"][0]
+        return {
+            "trailingPE":  mods.get("summaryDetail", {})
+                               .get("trailingPE", {}).get("raw"),
+            "priceToBook": mods.get("defaultKeyStatistics", {})
+                               .get("priceToBook", {}).get("raw"),
+        }
+    except Exception:
+        return {}
+
+
+@st.cache_data(ttl=600, persist="disk", max_entries=64)
+def fetch_google_news(query: str) -> list[dict]:
+    import fastfeedparser as feedparser
+    q = urllib.parse.quote(query)
+    url = f"https://news.google.com/rss/search?q={q}&hl=ja&gl=JP&ceid=JP:ja"
+    try:
+        feed = feedparser.parse(url)
+        # published は ISO8601 正規化済みなので先頭 10 文字がそのまま日付
+        results = []
+        for e in feed.entries[:20]:
+            title = getattr(e, "title", "")
+            results.append({
+                "date":   e.published[:10] if getattr(e, "published", None) else "",
+                "title":  title,
+                "link":   getattr(e, "link", ""),
+                # fastfeedparser は <source> 要素を公開しないため、Google News が
+                # タイトル末尾に付ける「 - 媒体名」を出典として使う
+                "source": title.rsplit(" - ", 1)[1] if " - " in title else "Google News",
+            })
+        return results
+    except Exception:
+        return []
+
+
+# IR ページの取得上限。ニュース一覧は大抵ページ前半にあるので先頭だけ読む
+_IR_MAX_BYTES = 262144
+
+
+def _header_encoding(resp) -> str | None:
+    """HTTP ヘッダーで明示された文字コード（無ければ None）"""
+    if "charset" in resp.headers.get("content-type", "").lower():
+        return resp.encoding
+    return None
+
+
+def _parse_ir_lists(content: bytes, url: str, encoding: str | None = None) -> list[dict]:
+    from lxml import html as lxml_html
+    ul_xp, li_a_xp, dl_xp = _ir_xpaths()
+    results = []
+    # 文書内に charset 宣言が無いページはヘッダーの文字コードで復号してから
+    # 渡す（バイト列のままだと lxml が latin-1 に落ちて日本語が化ける）
+    if encoding and b"charset" not in content[:2048].lower():
+        tree = lxml_html.fromstring(content.decode(encoding, "replace"))
+    else:
+        tree = lxml_html.fromstring(content)
+
+    # パターン1: ul > li > a
+    for ul in ul_xp(tree):
+        batch = []
+        for li in li_a_xp(ul):
+            a = li.find(".//a")
+            title = a.text_content().strip()
+            if len(title) < 5:
+                continue
+            href = a.get("href", "")
+            if href and not href.startswith("http"):
+                href = urllib.parse.urljoin(url, href)
+            batch.append({"date": _extract_date(li), "title": title,
+                          "link": href, "source": "IR"})
+        if len(batch) >= 3:
+            results = batch[:20]
+            break
+
+    # パターン2: dl > dt + dd
+    if not results:
+        for dl in dl_xp(tree):
+            dts = dl.findall(".//dt")
+            dds = dl.findall(".//dd")
+            if len(dts) < 2:
+                continue
+            batch = []
+            for dt, dd in zip(dts, dds):
+                a = dd.find(".//a")
+                if a is None:
+                    a = dt.find(".//a")
+                if a is None:
+                    continue
+                title = a.text_content().strip()
+                href = a.get("href", "")
+                if href and not href.startswith("http"):
+                    href = urllib.parse.urljoin(url, href)
+                batch.append({"date": _extract_date(dt) or _extract_date(dd),
+                              "title": title, "link": href, "source": "IR"})
+            if len(batch) >= 2:
+                results = batch[:20]
+                break
+    return results
+
+
+@st.cache_data(ttl=600, persist="disk", max_entries=64)
+def fetch_ir_news(url: str) -> list[dict]:
+    try:
+        resp = _get_session().get(url, timeout=15, stream=True)
+        resp.raise_for_status()
+        # チャンク長は 8192 より短いことがあるため、打ち切ったかどうかは
+        # バイト数でなくイテレータが尽きたかで判定する
+        chunks, size, truncated = [], 0, False
+        for chunk in resp.iter_content(8192):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= _IR_MAX_BYTES:
+                truncated = True
+                break
+        resp.close()
+        content = b"".join(chunks)
+        results = _parse_ir_lists(content, url, _header_encoding(resp))
+        if not results and truncated:
+            # 一覧がページ後半にあった場合だけ全文を取り直す
+            resp = _get_session().get(url, timeout=15)
+            resp.raise_for_status()
+            results = _parse_ir_lists(resp.content, url, _header_encoding(resp))
+        return results
+    except Exception:
+        return []
+
+
+# ======================================================================
+# チャート作成
+# ======================================================================
+
+# Plotly に渡す最大データ点数（3年・5年はこれを超えるので LTTB で間引く）
+_MAX_PLOT_POINTS = 500
+
+# 折れ線の塗りに使う 2 色の RGB 値（毎回 16 進パースしない）
+_HEX_RGB = {"#e74c3c": "231,76,60", "#3498db": "52,152,219"}
+
+
+def _lttb_indices(x, y, n_out: int):
+    """純 NumPy 版 LTTB（tsdownsample が無い環境用のフォールバック）"""
+    import numpy as np
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1, dtype=np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    x = x.astype("float64")
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if hi <= lo:
+            idx[i + 1] = a = lo
+            continue
+        if i < n_out - 3 and edges[i + 2] > edges[i + 1]:
+            avg_x = x[edges[i + 1]:edges[i + 2]].mean()
+            avg_y = y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x) * (by - y[a]) - (x[a] - bx) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def _downsample_hist(hist: pd.DataFrame, n_out: int = _MAX_PLOT_POINTS) -> pd.DataFrame:
+    """終値を基準に LTTB で間引く。O/H/L/V も同じ行を残すので足は揃ったまま"""
+    if len(hist) <= n_out:
+        return hist
+    x = hist.index.astype("int64").to_numpy()
+    y = hist["Close"].to_numpy(dtype="float64")
+    try:
+        from tsdownsample import MinMaxLTTBDownsampler
+        idx = MinMaxLTTBDownsampler().downsample(x, y, n_out=n_out)
+    except ImportError:
+        idx = _lttb_indices(x, y, n_out)
+    return hist.iloc[idx]
+
+
+def _binned_volume(hist: pd.DataFrame, period_label: str):
+    """長期間表示では出来高を週／月単位に集計して棒の本数を減らす"""
+    if period_label not in ("1年", "3年", "5年"):
+        return None
+    freq   = "W" if period_label == "1年" else "ME"
+    vol    = hist["Volume"].resample(freq).sum()
+    closes = hist["Close"].resample(freq).last()
+    opens  = hist["Open"].resample(freq).first()
+    return vol, closes, opens
+
+
+def make_stock_chart(hist: pd.DataFrame, comp: dict, period_label: str) -> go.Figure:
+    """ローソク足 + 移動平均 + 出来高"""
+    import numpy as np
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    ds = _downsample_hist(hist)
+    fig = make_subplots(
+        rows=2, cols=1, shared_xaxes=True,
+        vertical_spacing=0.04, row_heights=[0.75, 0.25],
+    )
+    fig.add_trace(go.Candlestick(
+        x=ds.index,
+        open=ds["Open"], high=ds["High"],
+        low=ds["Low"],  close=ds["Close"],
+        name="株価",
+        increasing=dict(line=dict(color="#e74c3c"), fillcolor="#e74c3c"),
+        decreasing=dict(line=dict(color="#3498db"), fillcolor="#3498db"),
+    ), row=1, col=1)
+
+    for window, color, dash in [(5, "orange", "solid"), (25, "#8e44ad", "solid"), (75, "#27ae60", "dot")]:
+        if len(hist) >= window:
+            # MA は元データで計算し、間引いた行だけ描画する
+            ma = hist["Close"].rolling(window).mean()
+            fig.add_trace(go.Scattergl(
+                x=ds.index, y=ma.loc[ds.index],
+                name=f"{window}日MA",
+                line=dict(color=color, width=1.5, dash=dash),
+                opacity=0.85,
+            ), row=1, col=1)
+
+    binned = _binned_volume(hist, period_label)
+    if binned is not None:
+        vol, closes, opens = binned
+        vol_x, vol_y = vol.index, vol
+    else:
+        vol_x, vol_y = ds.index, ds["Volume"]
+        closes, opens = ds["Close"], ds["Open"]
+    vol_colors = np.where(closes.values >= opens.values,
+                          "#e74c3c", "#3498db").tolist()
+    fig.add_trace(go.Bar(
+        x=vol_x, y=vol_y, name="出来高",
+        marker_color=vol_colors, opacity=0.65,
+    ), row=2, col=1)
+
+    fig.update_layout(**_common_layout(
+        title=f"{comp['name']}（{comp['code']}）ローソク足チャート（{period_label}）",
+        xaxis_rangeslider_visible=False,
+        height=620,
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02,
+                    xanchor="right", x=1, font=_LEGEND_FONT,
+                    bgcolor="rgba(255,255,255,0.9)", bordercolor="#ddd", borderwidth=1),
+        yaxis_title="株価（円）",
+        yaxis2_title="出来高",
+        margin=dict(l=70, r=30, t=90, b=30),
+        hovermode="x unified",
+    ))
+    fig.update_xaxes(showspikes=True, spikemode="across", spikethickness=1)
+    _style_axes(fig)
+    fig.update_xaxes(tickformat=_ja_date_format(period_label))
+    return fig
+
+
+def make_line_chart(hist: pd.DataFrame, comp: dict, period_label: str) -> go.Figure:
+    """終値推移（折れ線）"""
+    import plotly.graph_objects as go
+
+    hist = _downsample_hist(hist)
+    close = hist["Close"]
+    color = "#e74c3c" if close.iloc[-1] >= close.iloc[0] else "#3498db"
+    rgb = _HEX_RGB[color]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=hist.index, y=close,
+        mode="lines", name="終値",
+        line=dict(color=color, width=2),
+        fill="tozeroy", fillcolor=f"rgba({rgb},0.08)",
+        hovertemplate="%{x|%Y-%m-%d}<br>終値: %{y:,.0f}円<extra></extra>",
+    ))
+    fig.add_hline(
+        y=close.iloc[0], line_dash="dot", line_color="gray", opacity=0.6,
+        annotation_text=f"起点 {close.iloc[0]:,.0f}円",
+        annotation_position="right",
+    )
+    fig.update_layout(**_common_layout(
+        title=f"{comp['short']} 終値推移（{period_label}）",
+        height=480, xaxis_title="日付", yaxis_title="株価（円）",
+        margin=dict(l=70, r=30, t=70, b=50),
+        hovermode="x unified",
+    ))
+    _style_axes(fig)
+    fig.update_xaxes(tickformat=_ja_date_format(period_label))
+    return fig
+
+
+def make_volume_chart(hist: pd.DataFrame, comp: dict, period_label: str) -> go.Figure:
+    """出来高棒グラフ"""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    binned = _binned_volume(hist, period_label)
+    if binned is not None:
+        vol, closes, opens = binned
+        vol_x, vol_y = vol.index, vol
+    else:
+        hist = _downsample_hist(hist)
+        vol_x, vol_y = hist.index, hist["Volume"]
+        closes, opens = hist["Close"], hist["Open"]
+    vol_colors = np.where(closes.values >= opens.values,
+                          "#e74c3c", "#3498db").tolist()
+    fig = go.Figure(go.Bar(
+        x=vol_x, y=vol_y,
+        marker_color=vol_colors, opacity=0.75, name="出来高",
+        hovertemplate="%{x|%Y-%m-%d}<br>出来高: %{y:,.0f}<extra></extra>",
+    ))
+    fig.update_layout(**_common_layout(
+        title=f"{comp['short']} 出来高（{period_label}）",
+        height=400, xaxis_title="日付", yaxis_title="出来高",
+        margin=dict(l=70, r=30, t=70, b=50),
+    ))
+    _style_axes(fig)
+    fig.update_xaxes(tickformat=_ja_date_format(period_label))
+    return fig
+
+
+@st.cache_resource(ttl=300, max_entries=64, hash_funcs={
+    # DataFrame 全体を pickle させず O(1) のキーでハッシュする
+    pd.DataFrame: lambda df: (df.index[0], df.index[-1], len(df),
+                              float(df["Close"].iloc[-1])),
+})
+def build_figures(ticker: str, period_label: str,
+                  hist: pd.DataFrame) -> tuple[go.Figure, go.Figure, go.Figure]:
+    """3 種のチャートをまとめて構築し、再実行間で使い回す"""
+    comp = next(c for c in COMPANIES if c["ticker"] == ticker)
+    return (
+        make_stock_chart(hist, comp, period_label),
+        make_line_chart(hist, comp, period_label),
+        make_volume_chart(hist, comp, period_label),
+    )
+
+
+# ======================================================================
+# 企業概要・株価指標 比較表
+# ======================================================================
+
+@st.cache_data
+def build_overview_table() -> pd.DataFrame:
+    rows = []
+    for c in COMPANIES:
+        rows.append({
+            "会社名":       c["name"],
+            "上場状況":     c["market"],
+            "証券コード":   c["code"],
+            "主力製品":     c["product"],
+            "サービス概要": c["service"],
+            "ターゲット":   c["target"],
+            "公式サイト":   c["web_url"],
+        })
+    return pd.DataFrame(rows).set_index("会社名")
+
+
+def _price_snapshot(stocks: dict) -> tuple:
+    """stocks からハッシュ可能なスナップショットを抽出（キャッシュキー兼データ）"""
+    snap = []
+    for comp in COMPANIES:
+        name = comp["name"]
+        if name not in stocks or stocks[name].empty:
+            snap.append((name, None))
+            continue
+        hist = stocks[name]
+        info = fetch_info(comp["ticker"])
+        close = hist["Close"]
+        snap.append((name, (
+            float(close.iloc[-1]),
+            float(close.iloc[-2] if len(close) >= 2 else close.iloc[-1]),
+            float(close.iloc[0]),
+            float(hist["High"].max()),
+            float(hist["Low"].min()),
+            info.get("trailingPE"),
+            info.get("priceToBook"),
+        )))
+    return tuple(snap)
+
+
+@st.cache_data(ttl=300)
+def build_stock_metrics_table(period_label: str, snapshot: tuple) -> pd.DataFrame:
+    rows = []
+    snap_map = dict(snapshot)
+    for comp in COMPANIES:
+        vals = snap_map.get(comp["name"])
+        if vals is None:
+            rows.append({
+                "会社名":    comp["short"],
+                "現在値（円）": "---",
+                "前日比（%）": "---",
+                f"期間騰落率（{period_label}）": "---",
+                "期間高値（円）": "---",
+                "期間安値（円）": "---",
+                "PER（倍）": "---",
+                "PBR（倍）": "---",
+                "備考":      comp["market"],
+            })
+            continue
+        price, prev_close, first, high, low, per, pbr = vals
+        chg_pct = (price - prev_close) / prev_close * 100 if prev_close else 0
+        ret     = (price / first - 1) * 100
+        rows.append({
+            "会社名":    comp["short"],
+            "現在値（円）": f"{price:,.0f}",
+            "前日比（%）": f"{chg_pct:+.2f}%",
+            f"期間騰落率（{period_label}）": f"{ret:+.2f}%",
+            "期間高値（円）": f"{high:,.0f}",
+            "期間安値（円）": f"{low:,.0f}",
+            "PER（倍）": f"{per:.1f}" if per else "---",
+            "PBR（倍）": f"{pbr:.2f}" if pbr else "---",
+            "備考":      comp["market"],
+        })
+    return pd.DataFrame(rows).set_index("会社名")
+
+
+# ======================================================================
+# 表示ヘルパー
+# ======================================================================
+
+def render_stock_metrics(hist: pd.DataFrame, comp: dict, period_label: str):
+    info    = fetch_info(comp["ticker"])
+    latest  = hist.iloc[-1]
+    prev    = hist.iloc[-2] if len(hist) >= 2 else hist.iloc[-1]
+    price   = latest["Close"]
+    chg     = price - prev["Close"]
+    chg_pct = chg / prev["Close"] * 100 if prev["Close"] else 0
+    ret     = (hist["Close"].iloc[-1] / hist["Close"].iloc[0] - 1) * 100
+    per = info.get("trailingPE")
+    pbr = info.get("priceToBook")
+
+    c1, c2, c3, c4, c5, c6, c7 = st.columns(7)
+    c1.metric("現在値（円）", f"{price:,.0f}", f"{chg:+.0f}（{chg_pct:+.2f}%）")
+    c2.metric("出来高",      f"{int(latest['Volume']):,}")
+    c3.metric(f"期間騰落率（{period_label}）", f"{ret:+.2f}%")
+    c4.metric("期間高値（円）", f"{hist['High'].max():,.0f}")
+    c5.metric("期間安値（円）", f"{hist['Low'].min():,.0f}")
+    c6.metric("PER", f"{per:.1f}倍" if per else "---")
+    c7.metric("PBR", f"{pbr:.2f}倍" if pbr else "---")
+
+
+def render_stock_tabs(hist: pd.DataFrame, comp: dict, period_label: str):
+    candle_fig, line_fig, vol_fig = build_figures(comp["ticker"], period_label, hist)
+    ct1, ct2, ct3, ct4 = st.tabs(["ローソク足", "終値推移", "出来高", "データ表"])
+    with ct1:
+        st.plotly_chart(candle_fig, use_container_width=True)
+    with ct2:
+        st.plotly_chart(line_fig, use_container_width=True)
+    with ct3:
+        st.plotly_chart(vol_fig, use_container_width=True)
+    with ct4:
+        df_t = hist.loc[:, ["Open", "High", "Low", "Close", "Volume"]]
+        df_t.index = pd.to_datetime(df_t.index).strftime("%Y-%m-%d")
+        df_t.index.name = "日付"
+        df_t.columns = ["始値", "高値", "安値", "終値", "出来高"]
+        df_t["前日比（円）"] = df_t["終値"].diff().round(0)
+        df_t["前日比（%）"] = (df_t["終値"].pct_change() * 100).round(2)
+        df_t = df_t.iloc[::-1]
+
+        # 符号に応じた文字色をセル単位の .map でなく列単位の np.where で一括計算
+        import numpy as np
+        color_df = pd.DataFrame("", index=df_t.index, columns=df_t.columns)
+        for col in ("前日比（円）", "前日比（%）"):
+            vals = df_t[col].to_numpy(dtype="float64")
+            color_df[col] = np.where(vals > 0, "color: #e74c3c",
+                                     np.where(vals < 0, "color: #3498db", ""))
+
+        styled = (
+            df_t.style
+            .format({
+                "始値": "{:,.0f}", "高値": "{:,.0f}",
+                "安値": "{:,.0f}", "終値": "{:,.0f}", "出来高": "{:,.0f}",
+                "前日比（円）": lambda x: f"{x:+.0f}" if pd.notna(x) else "---",
+                "前日比（%）": lambda x: f"{x:+.2f}%" if pd.notna(x) else "---",
+            })
+            .apply(lambda _: color_df, axis=None)
+        )
+        st.dataframe(styled, use_container_width=True, height=500)
+
+
+def render_news(comp: dict):
+    col_gn, col_ir = st.columns(2)
+
+    with col_gn:
+        st.markdown("**Google News**")
+        with st.spinner("取得中..."):
+            items = fetch_google_news(comp["news_q"])
+        if not items:
+            st.info("ニュースが見つかりませんでした。")
+        else:
+            for item in items[:10]:
+                if item["link"]:
+                    st.markdown(f"[{item['title']}]({item['link']})")
+                else:
+                    st.markdown(item["title"])
+                st.caption(f"{item['date']} | {item['source']}")
+                st.divider()
+
+    with col_ir:
+        st.markdown("**IR / ニュース**")
+        with st.spinner("取得中..."):
+            items = fetch_ir_news(comp["ir_url"])
+        if not items:
+            st.info("自動取得できませんでした。")
+            st.markdown(f"[公式ページを開く]({comp['ir_url']})")
+        else:
+            for item in items[:10]:
+                if item["link"]:
+                    st.markdown(f"[{item['title']}]({item['link']})")
+                else:
+                    st.markdown(item["title"])
+                if item["date"]:
+                    st.caption(item["date"])
+                st.divider()
+
+
+# ======================================================================
+# メイン
+# ======================================================================
+
+def main():
+    # ── サイドバー ──────────────────────────────────────────────────────
+    with st.sidebar:
+        st.markdown("## HR-Tech 比較ダッシュボード")
+        st.divider()
+
+        period_map = {
+            "1週間": "5d", "1ヶ月": "1mo", "3ヶ月": "3mo",
+            "6ヶ月": "6mo", "1年": "1y", "3年": "3y", "5年": "5y",
+        }
+        period_label = st.selectbox("表示期間", list(period_map.keys()), index=2)
+        period = period_map[period_label]
+
+        st.divider()
+        auto_refresh = st.toggle("自動更新", value=True)
+        refresh_min = 5
+        if auto_refresh:
+            refresh_min = st.select_slider(
+                "更新間隔（分）", options=[1, 2, 5, 10, 15, 30], value=5
+            )
+
+        st.divider()
+        st.markdown("**対象企業**")
+        for comp in COMPANIES:
+            icon = "📈" if comp["ticker"] else ("🔒" if comp["market"] == "上場廃止" else "🏢")
+            st.markdown(f"{icon} **{comp['short']}** — {comp['market']}")
+
+        st.divider()
+        st.markdown("**公式リンク**")
+        for comp in COMPANIES:
+            st.markdown(f"[{comp['short']}]({comp['web_url']})")
+
+    # ── 自動更新（スクリプト再実行のみ。ページ全体はリロードしない）─────
+    if auto_refresh:
+        from streamlit_autorefresh import st_autorefresh
+        st_autorefresh(interval=refresh_min * 60 * 1000, key="auto_refresh")
+
+    # ── ヘッダー ────────────────────────────────────────────────────────
+    col_title, col_btn = st.columns([6, 1])
+    with col_title:
+        st.title("📊 HR-Tech 株価・ニュース 比較ダッシュボード")
+        st.caption(
+            "対象: " + " ／ ".join(c["short"] for c in COMPANIES)
+            + f"　|　最終更新: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}"
+            + (f"　|　{refresh_min}分毎に自動更新中" if auto_refresh else "")
+        )
+    with col_btn:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("🔄 手動更新", use_container_width=True, type="primary"):
+            st.cache_data.clear()
+            st.rerun()
+
+    st.divider()
+
+    # ── 株価・ニュースデータ取得（並列で先読み）──────────────────────────
+    stocks: dict = {}
+    tickers = [(c["name"], c["ticker"]) for c in COMPANIES if c["ticker"]]
+    with st.spinner("株価・ニュースデータを取得中..."):
+        with ThreadPoolExecutor(max_workers=12) as ex:
+            futures = {ex.submit(fetch_stock, ticker, period): name
+                       for name, ticker in tickers}
+            # ニュース系もここで温めておく。結果は @st.cache_data に載るので
+            # 各タブの render_news 内の呼び出しはキャッシュヒットで即返る
+            news_futs = [ex.submit(fetch_google_news, c["news_q"])
+                         for c in COMPANIES]
+            news_futs += [ex.submit(fetch_ir_news, c["ir_url"])
+                          for c in COMPANIES]
+            for fut in as_completed(futures):
+                stocks[futures[fut]] = fut.result()
+            wait(news_futs)
+
+    # ── タブ ────────────────────────────────────────────────────────────
+    tab_labels = ["📊 4社比較"] + [
+        ("📈 " if c["ticker"] else "📰 ") + c["short"]
+        for c in COMPANIES
+    ]
+    tab_compare, *company_tabs = st.tabs(tab_labels)
+
+    # ════════════════════════════════════════════
+    # 比較タブ
+    # ════════════════════════════════════════════
+    with tab_compare:
+
+        # ① 企業概要比較表
+        st.markdown("### 企業概要比較")
+        st.dataframe(build_overview_table(), use_container_width=True)
+
+        st.divider()
+
+        # ② 株価指標比較表
+        st.markdown("### 株価指標比較")
+        st.dataframe(build_stock_metrics_table(period_label, _price_snapshot(stocks)),
+                     use_container_width=True)
+        st.caption(
+            "※ カオナビは上場廃止のためデータなし。"
+            "SmartHR・HRブレインは非上場のためデータなし。"
+        )
+
+    # ════════════════════════════════════════════
+    # 個別企業タブ
+    # ════════════════════════════════════════════
+    for comp, tab in zip(COMPANIES, company_tabs):
+        with tab:
+            name = comp["name"]
+
+            status_color = (
+                "#27ae60" if comp["ticker"] else
+                ("#e67e22" if comp["market"] == "上場廃止" else "#95a5a6")
+            )
+            st.markdown(
+                f"## {name}"
+                f"<span class='company-badge' style='background:{status_color}22;"
+                f"color:{status_color};border:1px solid {status_color}66'>"
+                f"{comp['market']}</span>",
+                unsafe_allow_html=True,
+            )
+
+            # 上場企業：株価情報あり
+            if comp["ticker"] and name in stocks and not stocks[name].empty:
+                hist = stocks[name]
+                render_stock_metrics(hist, comp, period_label)
+                st.divider()
+                render_stock_tabs(hist, comp, period_label)
+                st.divider()
+
+            # データなし（上場廃止 or 非上場）
+            elif comp["ticker"]:
+                st.warning(f"{name} の株価データを取得できませんでした。")
+                st.divider()
+            else:
+                st.info(
+                    f"**{name}** は{comp['market']}のため株価データはありません。  \n"
+                    "ニュース・IR 情報のみ表示します。"
+                )
+                st.divider()
+
+            # ニュース（全社共通）
+            st.markdown("### ニュース・IR 情報")
+            render_news(comp)
+
+    # ── フッター ────────────────────────────────────────────────────────
+    st.divider()
+    st.caption(
+        "⚠️ このアプリは情報提供のみを目的としています。"
+        "投資判断の参考にする場合は、必ず公式情報をご確認ください。"
+    )
+    st.caption(
+        "データソース: Yahoo Finance ／ Google News RSS ／ 各社 IR・ニュースページ  \n"
+        "カオナビは東証グロース上場後に非公開化（上場廃止）。SmartHR・HRブレインは非上場企業。"
+    )
+
+
+if __name__ == "__main__":
+    main()